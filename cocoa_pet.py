@@ -5,19 +5,49 @@ Tested on macOS 14 (Apple M-series).
 Place your GIF in assets/doge/3d-doge-spins-like-coin-idle.gif
 """
 
-import os, random, sys, time
+import os, random, sys, traceback
+from time import monotonic as _now
 import AppKit
 from AppKit import (
-    NSApplication, NSApp, NSWindow, NSImage, NSImageView,
+    NSApplication, NSApp, NSWindow, NSImageView,
     NSWindowStyleMaskBorderless, NSBackingStoreBuffered,
-    NSScreen, NSColor, NSEvent, NSMenu, NSMenuItem, NSPoint,
+    NSScreen, NSColor, NSEvent, NSMenu, NSMenuItem, NSPoint, NSAnimationContext,
 )
-from Foundation import NSObject, NSTimer, NSOperationQueue
-from PyObjCTools import AppHelper
+from Foundation import NSObject, NSTimer, NSOperationQueue, NSNotificationCenter, NSDate
 import Quartz
+import QuartzCore
+import objc
 from threading import Lock
-import requests, json
+import json
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# patterns used on every chat turn – compiled once at import
+_RE_DOGE = re.compile(r"(doge\s*coin|dogecoin)", re.I)
+_RE_MARKET = re.compile(r"\b(price|worth|value|market|doing|performance|up|down|trend)\b", re.I)
+_RE_MOOD_TAG = re.compile(r"<mood:([A-Z]+)>")
+_RE_MOOD_SUB = re.compile(r"<mood:[A-Z]+>")
+_RE_CHITCHAT = re.compile(
+    r"^\s*(hi|hello|hey|yo|sup|thanks|thank you|ok|okay|lol|bye|good (morning|night))\b", re.I
+)
+
+_ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets", "doge")
+_SIZE = (128, 128)     # pet window / animation frame size in points
+_PRICE_TTL_S = 3600    # refresh the CoinGecko price at most once per hour
+
+# bubble colours, shared by every bubble instead of re-created per window
+_BUBBLE_YELLOW_CG = NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 1.0, 0.75, 0.95).CGColor()
+_BUBBLE_BLUE_CG = NSColor.colorWithCalibratedRed_green_blue_alpha_(0.8, 0.9, 1.0, 0.95).CGColor()
+_CLEAR = NSColor.clearColor()
+
+# worker threads for the look-ups done before each chat request
+_HTTP_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def _needs_web(msg: str) -> bool:
+    """Short greetings / chit-chat never get a useful DuckDuckGo answer."""
+    return len(msg.split()) >= 4 and not _RE_CHITCHAT.match(msg)
 
 
 # ------------------------------------------------------------------ drag-helper
@@ -61,12 +91,9 @@ class DraggableImageView(NSImageView):
                                     win.frame().origin.y + dy))
 
         # mark as drag so mouseUp won't treat as simple click
+        # (bubbles are child windows and follow the pet on their own)
         self._didDrag = True
 
-        # inform delegate so bubbles follow
-        if self.delegate:
-            self.delegate.reposition_bubbles()
-
     # -------- right mouse ----------------------------------------------------
     def rightMouseDown_(self, event):
         if self.delegate:
@@ -97,13 +124,13 @@ class ChatBubble(NSWindow):
             return None
 
         self.setOpaque_(False)
-        self.setBackgroundColor_(NSColor.clearColor())
+        self.setBackgroundColor_(_CLEAR)
         self.setLevel_(AppKit.NSFloatingWindowLevel)
 
         # rounded yellow background using layer
         self.contentView().setWantsLayer_(True)
         bg_layer = self.contentView().layer()
-        bg_layer.setBackgroundColor_(NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 1.0, 0.75, 0.95).CGColor())
+        bg_layer.setBackgroundColor_(_BUBBLE_YELLOW_CG)
         bg_layer.setCornerRadius_(12.0)
 
         # label
@@ -112,17 +139,18 @@ class ChatBubble(NSWindow):
         tf.setBordered_(False)
         tf.setEditable_(False)
         tf.setSelectable_(False)
-        tf.setBackgroundColor_(NSColor.clearColor())
+        tf.setBackgroundColor_(_CLEAR)
         tf.setAlignment_(AppKit.NSCenterTextAlignment)
         tf.setFont_(AppKit.NSFont.boldSystemFontOfSize_(13))
         self.contentView().addSubview_(tf)
+        self.tf = tf
 
         self.orderFront_(None)
-        NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+        self._close_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
             4.0, self, "closeBubble:", None, False
         )
 
-        # keep reference to parent window for repositioning
+        # keep reference to parent window (the pet)
         self.parent_win = parent_win
         self.size = (w, h)
         self.owner = None   # PetDelegate will set this after creation
@@ -132,17 +160,30 @@ class ChatBubble(NSWindow):
 
         return self
 
+    def update_message(self, message):
+        """Replace the text (streamed replies) and restart the close countdown."""
+        self.tf.setStringValue_(message)
+        if self._close_timer is not None:
+            self._close_timer.invalidate()
+        self._close_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            4.0, self, "closeBubble:", None, False
+        )
+
+    def close(self):
+        # drop the pending auto-close timer (it retains this window)
+        if self._close_timer is not None:
+            self._close_timer.invalidate()
+            self._close_timer = None
+        objc.super(ChatBubble, self).close()
+
     # Allow a borderless window to accept key events
     def canBecomeKeyWindow(self):  # noqa: N802
         return True
 
     def closeBubble_(self, _):
         # notify owner (PetDelegate) so it can drop the reference
-        if self.owner is not None:
-            try:
-                self.owner.remove_bubble(self)
-            except Exception:
-                pass
+        if self.owner is not None and self in self.owner._bubbles:
+            self.owner.remove_bubble(self)
         self.close()
         # when a chat bubble disappears switch back to idle animation
         if self.owner is not None:
@@ -180,13 +221,13 @@ class InputBubble(NSWindow):
         self.setFrame_display_( ((x, y), (w, h)), False)
 
         self.setOpaque_(False)
-        self.setBackgroundColor_(NSColor.clearColor())
+        self.setBackgroundColor_(_CLEAR)
         self.setLevel_(AppKit.NSFloatingWindowLevel)
 
         # rounded yellow background via layer properties
         self.contentView().setWantsLayer_(True)
         bg_layer = self.contentView().layer()
-        bg_layer.setBackgroundColor_(NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 1.0, 0.75, 0.95).CGColor())
+        bg_layer.setBackgroundColor_(_BUBBLE_YELLOW_CG)
         bg_layer.setCornerRadius_(12.0)
 
         # text field
@@ -211,7 +252,7 @@ class InputBubble(NSWindow):
         self.makeKeyAndOrderFront_(None)
         self.text_field.becomeFirstResponder()
 
-        # store for reposition
+        # keep reference to parent window (the pet)
         self.parent_win = parent_win
         self.size = (w, h)
 
@@ -240,13 +281,10 @@ class InputBubble(NSWindow):
 
 # ----------------------------------------------------------- main application
 class PetDelegate(NSObject):
+    should_quit = False    # set on terminate; ends _run_event_loop()
+
     def applicationDidFinishLaunching_(self, notification):
-        gif_path = os.path.join(
-            os.path.dirname(__file__),
-            "assets",
-            "doge",
-            "3d-doge-spins-like-coin-idle.gif",
-        )
+        gif_path = os.path.join(_ASSET_DIR, "3d-doge-spins-like-coin-idle.gif")
         if not os.path.exists(gif_path):
             AppKit.NSRunAlertPanel(
                 "GIF not found",
@@ -259,7 +297,7 @@ class PetDelegate(NSObject):
             return
 
         # create transparent border-less window
-        size = (128, 128)
+        size = _SIZE
         screen = NSScreen.mainScreen().frame()
         origin = (screen.size.width / 2 - size[0] / 2, screen.size.height / 2 - size[1] / 2)
         rect = (origin, size)
@@ -270,31 +308,32 @@ class PetDelegate(NSObject):
             False,
         )
         self.window.setOpaque_(False)
-        self.window.setBackgroundColor_(NSColor.clearColor())
+        self.window.setBackgroundColor_(_CLEAR)
         self.window.setLevel_(AppKit.NSFloatingWindowLevel)
         self.window.setIgnoresMouseEvents_(False)
         self.window.setHasShadow_(False)
 
-        # load GIF frames ourselves so we can animate with a timer
-        src = Quartz.CGImageSourceCreateWithURL(AppKit.NSURL.fileURLWithPath_(gif_path), None)
-        frame_cnt = Quartz.CGImageSourceGetCount(src)
-        self.frames = []
-        for i in range(frame_cnt):
-            cgimg = Quartz.CGImageSourceCreateImageAtIndex(src, i, None)
-            if cgimg is None:
-                continue  # skip broken frame to avoid crashes
-            nsimg = NSImage.alloc().initWithCGImage_size_(cgimg, size)
-            if nsimg is not None:
-                self.frames.append(nsimg)
-
-        if not self.frames:
-            return  # failed to load any frames, bail
-
-        self.frame_idx = 0
+        # decoded frames per GIF file – each GIF is decoded only once, on a
+        # serial background queue so the UI never waits for it
+        self._frame_cache = {}
+        self._frame_px = int(_SIZE[0] * self.window.backingScaleFactor())
+        self._decode_queue = NSOperationQueue.alloc().init()
+        self._decode_queue.setMaxConcurrentOperationCount_(1)
+        self._decoding = set()
+        self._wanted_gif = None
+        self.frames = []    # filled in once the idle GIF has been decoded
 
         self.img_view = DraggableImageView.alloc().initWithFrame_(((0, 0), size))
-        self.img_view.setImage_(self.frames[0])
         self.window.setContentView_(self.img_view)
+
+        # frames are shown by a plain sublayer whose "contents" is animated
+        # by Core Animation – no per-frame Python callback needed
+        self.img_view.setWantsLayer_(True)
+        self._anim_layer = QuartzCore.CALayer.layer()
+        self._anim_layer.setFrame_(((0, 0), size))
+        self._anim_layer.setContentsGravity_(QuartzCore.kCAGravityResizeAspect)
+        self._anim_layer.setContentsScale_(self.window.backingScaleFactor())
+        self.img_view.layer().addSublayer_(self._anim_layer)
         self.img_view.delegate = self      # <- give view a back-pointer
 
         # add system double-click recogniser (more reliable on trackpads)
@@ -304,10 +343,20 @@ class PetDelegate(NSObject):
         recogniser.setNumberOfClicksRequired_(2)
         self.img_view.addGestureRecognizer_(recogniser)
 
-        # drive animation (≈ 8 fps)
-        NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.06, self, "nextFrame:", None, True
+        # drive animation (≈ 16 fps); paused while the pet is fully covered
+        # or the displays are asleep
+        NSNotificationCenter.defaultCenter().addObserver_selector_name_object_(
+            self, "occlusionChanged:", AppKit.NSWindowDidChangeOcclusionStateNotification, self.window
+        )
+        ws_center = AppKit.NSWorkspace.sharedWorkspace().notificationCenter()
+        ws_center.addObserver_selector_name_object_(
+            self, "screensDidSleep:", AppKit.NSWorkspaceScreensDidSleepNotification, None
         )
+        ws_center.addObserver_selector_name_object_(
+            self, "occlusionChanged:", AppKit.NSWorkspaceScreensDidWakeNotification, None
+        )
+        self.set_animation("idle")
+        self._prefetch_animations()
 
         # build right-click menu once
         menu = NSMenu.alloc().initWithTitle_("pet_menu")
@@ -330,15 +379,18 @@ class PetDelegate(NSObject):
         self._bubbles = []
 
         # --- simple chat history -----------------------------------------
-        # stored as list of {"role": "user"|"assistant", "content": str}
-        self._chat_history = []
+        # stored as {"role": "user"|"assistant", "content": str}; the deque
+        # drops the oldest entry itself once the limit is reached
         self._max_history = 12   # keep the last N messages (system prompt not counted)
+        self._chat_history = deque(maxlen=self._max_history)
 
-        # HTTP session for web search
-        self._http = requests.Session()
+        # HTTP session for web search – created by _session() on first use
+        self._http = None
+        self._http_lock = Lock()
 
         # cache for CoinGecko price (update at most once per hour)
-        self._price_cache = {"ts": 0, "snippet": ""}
+        # ("ts" is a monotonic timestamp, primed so the first call fetches)
+        self._price_cache = {"ts": -_PRICE_TTL_S, "snippet": ""}
 
         # first price bubble shortly after launch
         NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
@@ -346,9 +398,18 @@ class PetDelegate(NSObject):
         )
 
         # periodic bubble every 10 minutes while idle
-        NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+        self._price_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
             600.0, self, "showPriceTimer:", None, True
         )
+        # exact timing is irrelevant – let macOS coalesce the wake-up
+        self._price_timer.setTolerance_(60.0)
+
+    def applicationWillTerminate_(self, notification):  # noqa: N802
+        self.should_quit = True
+        # may be missing if launch bailed out early (GIF not found)
+        price_timer = getattr(self, "_price_timer", None)
+        if price_timer is not None:
+            price_timer.invalidate()
 
     # ------------ event handlers ------------------------------------------------
     def show_chat(self):
@@ -368,11 +429,8 @@ class PetDelegate(NSObject):
         def respond(user_msg: str):
             self.set_animation("thinking")
 
-            # add user message to history
+            # add user message to history (oldest entry falls off)
             self._chat_history.append({"role": "user", "content": user_msg})
-            # trim if too long
-            if len(self._chat_history) > self._max_history:
-                self._chat_history = self._chat_history[-self._max_history:]
 
             import threading
             threading.Thread(
@@ -385,74 +443,40 @@ class PetDelegate(NSObject):
         ).initWithParent_sendCallback_(self.window, respond)
         print("InputBubble created")
 
-        # track for reposition
+        # attach to the pet window so it moves along when dragged
         self._input_bubble.owner = self
+        self.window.addChildWindow_ordered_(self._input_bubble, AppKit.NSWindowAbove)
 
     def ask_gpt_and_respond(self, user_msg: str):
         """Runs in a background thread."""
-        import openai, os, re
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
             # fallback: try to read from ~/.openai_api_key (just the key string)
             try:
                 key_path = os.path.expanduser("~/.openai_api_key")
                 if os.path.exists(key_path):
                     with open(key_path, "r", encoding="utf-8") as fh:
-                        openai.api_key = fh.read().strip()
+                        api_key = fh.read().strip()
             except Exception:
                 pass
 
-        # optional: live web snippet via DuckDuckGo Instant Answer API
+        # trigger on any mention of dogecoin / doge coin and finance-related words
+        price_intent = bool(_RE_DOGE.search(user_msg) and _RE_MARKET.search(user_msg))
+
+        # web snippet and live price are independent – fetch them concurrently
+        f_ddg = _HTTP_POOL.submit(self._fetch_ddg, user_msg) if _needs_web(user_msg) else None
+        f_price = _HTTP_POOL.submit(self._fetch_price_snippet) if price_intent else None
+
         snippet = ""
+        price_snippet = ""
         try:
-            resp = self._http.get(
-                "https://api.duckduckgo.com",
-                params={"q": user_msg, "format": "json", "no_html": 1, "t": "desktop-doge"},
-                timeout=5,
-            )
-            data = resp.json()
-            snippet = data.get("AbstractText") or data.get("Heading") or ""
-            if snippet:
-                snippet = snippet[:700]  # keep prompt small
+            if f_ddg is not None:
+                snippet = f_ddg.result(timeout=6)
         except Exception:
             snippet = ""
-
-        # If the user explicitly asks about dogecoin price, fetch live price
-        price_snippet = ""
-        price_intent = False
         try:
-            # trigger on any mention of dogecoin / doge coin and finance-related words
-            if re.search(r"(doge\s*coin|dogecoin)", user_msg, re.I):
-                # basic intent detection for price/market questions
-                if re.search(r"\b(price|worth|value|market|doing|performance|up|down|trend)\b", user_msg, re.I):
-                    price_intent = True
-            if price_intent:
-                import time
-                now = time.time()
-                # use cached value if <1h old
-                if now - self._price_cache["ts"] < 3600 and self._price_cache["snippet"]:
-                    price_snippet = self._price_cache["snippet"]
-                else:
-                    resp_p = self._http.get(
-                        "https://api.coingecko.com/api/v3/coins/markets",
-                        params={"vs_currency": "usd", "ids": "dogecoin"},
-                        timeout=5,
-                    )
-                    data_p = resp_p.json()
-                    if isinstance(data_p, list) and data_p:
-                        coin = data_p[0]
-                        price = coin.get("current_price")
-                        change = coin.get("price_change_percentage_24h")
-                        if price is not None:
-                            if change is not None:
-                                price_snippet = (
-                                    f"Dogecoin live price: ${price:.4f} USD (24h change: {change:+.2f}%). "
-                                    "Source: CoinGecko."
-                                )
-                            else:
-                                price_snippet = f"Dogecoin live price: ${price:.4f} USD (CoinGecko)."
-                            # update cache
-                            self._price_cache = {"ts": now, "snippet": price_snippet}
+            if f_price is not None:
+                price_snippet = f_price.result(timeout=6)
         except Exception:
             price_snippet = ""
 
@@ -483,34 +507,64 @@ class PetDelegate(NSObject):
                 "content": f"(web) {snippet}",
             })
 
-        messages += self._chat_history[-self._max_history:]
+        messages.extend(self._chat_history)
 
-        chat = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages,
-        )
-        answer = chat.choices[0].message.content.strip()
+        # the bubble is created on the first token and then updated in place
+        shown = {"bubble": None}
+
+        def _show(text):
+            bubble = shown["bubble"]
+            if bubble is None or not bubble.isVisible():
+                bubble = ChatBubble.alloc().initWithParent_message_(self.window, text)
+                self._add_bubble(bubble)
+                shown["bubble"] = bubble
+            else:
+                bubble.update_message(text)
+
+        answer_parts = []
+        try:
+            for delta in self._stream_chat(api_key, messages):
+                answer_parts.append(delta)
+
+                # hide the mood tag, including one that is still arriving
+                partial = "".join(answer_parts)
+                cut = partial.rfind("<")
+                if cut != -1 and ">" not in partial[cut:]:
+                    partial = partial[:cut]
+                partial = _RE_MOOD_SUB.sub("", partial).strip()
+                if partial:
+                    NSOperationQueue.mainQueue().addOperationWithBlock_(
+                        lambda t=partial: _show(t)
+                    )
+        except Exception:
+            # rate limit / server error / dropped stream: tell the user and
+            # unlock, otherwise the pet stays "thinking" with chat disabled
+            traceback.print_exc()
+
+            def _fail():
+                _show("Much error. Very sorry – try again.")
+                self.set_animation("idle")
+                self._chat_lock.release()
+
+            with objc.autorelease_pool():
+                NSOperationQueue.mainQueue().addOperationWithBlock_(_fail)
+            self._input_bubble = None
+            return
 
-        m = re.search(r"<mood:([A-Z]+)>", answer)
+        answer = "".join(answer_parts).strip()
+
+        m = _RE_MOOD_TAG.search(answer)
         mood = m.group(1) if m else "HAPPY"
-        answer = re.sub(r"<mood:[A-Z]+>", "", answer).strip()
+        answer = _RE_MOOD_SUB.sub("", answer).strip()
 
         print("answer:", answer, "mood:", mood)
 
-        # append assistant reply to history and trim
+        # append assistant reply to history
         self._chat_history.append({"role": "assistant", "content": answer})
-        if len(self._chat_history) > self._max_history:
-            self._chat_history = self._chat_history[-self._max_history:]
 
         # hop back to main thread to update UI safely
-        import objc
-
         def _finish():
-            bubble = ChatBubble.alloc().initWithParent_message_(
-                self.window, answer
-            )
-            bubble.owner = self
-            self._bubbles.append(bubble)
+            _show(answer)
 
             self.set_animation(mood.lower())
 
@@ -521,18 +575,141 @@ class PetDelegate(NSObject):
             NSOperationQueue.mainQueue().addOperationWithBlock_(_finish)
 
         # input bubble has closed itself; drop reference so we don't
-        # attempt to reposition a deallocated window.
+        # touch a deallocated window.
         self._input_bubble = None
 
-    # -------- animation timer callback --------------------------------------
-    def nextFrame_(self, _):
-        self.frame_idx = (self.frame_idx + 1) % len(self.frames)
-        self.img_view.setImage_(self.frames[self.frame_idx])
+    def _session(self):
+        """Return the shared HTTP session, importing requests on first use.
+
+        Keeps requests (and urllib3) off the launch path; called from the
+        worker threads, hence the lock.
+        """
+        with self._http_lock:
+            if self._http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                # small keep-alive pool shared by DuckDuckGo / CoinGecko /
+                # OpenAI, with a couple of retries on transient gateway errors
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=8,
+                    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # the chat POST also retries rate limits and 5xx (urllib3
+                # leaves POST out of its retryable methods by default);
+                # Retry-After is honoured
+                session.mount("https://api.openai.com/", HTTPAdapter(
+                    max_retries=Retry(
+                        total=2,
+                        backoff_factor=0.5,
+                        allowed_methods=None,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                    ),
+                ))
+                session.headers.update({"User-Agent": "desktop-doge/1.0"})
+                self._http = session
+            return self._http
+
+    def _stream_chat(self, api_key: str, messages: list):
+        """Yield reply tokens from OpenAI's chat completions endpoint.
+
+        Talks to the REST API directly over the pooled HTTP session (server-sent
+        events), so the app does not need the openai package.
+        """
+        resp = self._session().post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": f"Bearer {api_key}"},
+            json={"model": "gpt-4o-mini", "messages": messages, "stream": True},
+            stream=True,
+            timeout=(5, 60),
+        )
+        with resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue  # blank keep-alive / comment lines
+                data = line[6:]
+                if data == b"[DONE]":
+                    break
+                choices = json.loads(data).get("choices")
+                if not choices:
+                    continue
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+
+    def _fetch_ddg(self, user_msg: str) -> str:
+        """Optional live web snippet via DuckDuckGo Instant Answer API."""
+        try:
+            resp = self._session().get(
+                "https://api.duckduckgo.com",
+                params={"q": user_msg, "format": "json", "no_html": 1, "t": "desktop-doge"},
+                timeout=5,
+            )
+            data = resp.json()
+            snippet = data.get("AbstractText") or data.get("Heading") or ""
+            return snippet[:700]  # keep prompt small
+        except Exception:
+            return ""
 
-        # keep chat bubbles in sync with pet position if any
-        self.reposition_bubbles()
+    # -------- frame animation -----------------------------------------------
+    def _start_animation(self):
+        """Loop self.frames on the pet layer (one frame every 60 ms)."""
+        self._anim_layer.removeAnimationForKey_("spin")
+        if not self.frames:
+            return  # still decoding
+        self._anim_layer.setContents_(self.frames[0])
+        if len(self.frames) < 2:
+            return  # still image – nothing to animate
+        anim = QuartzCore.CAKeyframeAnimation.animationWithKeyPath_("contents")
+        anim.setValues_(self.frames)
+        anim.setDuration_(len(self.frames) * 0.06)
+        anim.setRepeatCount_(float("inf"))
+        anim.setCalculationMode_(QuartzCore.kCAAnimationDiscrete)
+        # frames only change every 60 ms – keep ProMotion displays from
+        # recompositing the pet at 120 Hz (CAFrameRateRange, macOS 12+)
+        if hasattr(anim, "setPreferredFrameRateRange_"):
+            anim.setPreferredFrameRateRange_((8.0, 30.0, 30.0))
+        self._anim_layer.addAnimation_forKey_(anim, "spin")
+
+    def _stop_animation(self):
+        self._anim_layer.removeAnimationForKey_("spin")
+
+    # NSWindowDidChangeOcclusionStateNotification observer
+    def occlusionChanged_(self, notification):  # noqa: N802
+        if self.window.occlusionState() & AppKit.NSWindowOcclusionStateVisible:
+            self._start_animation()
+        else:
+            self._stop_animation()
+
+    # NSWorkspaceScreensDidSleepNotification observer
+    def screensDidSleep_(self, notification):  # noqa: N802
+        self._stop_animation()
 
     # --- bubble housekeeping -------------------------------------------------
+    def _add_bubble(self, bubble):
+        """Keep a strong ref to *bubble* and attach it to the pet window.
+
+        As a child window it moves with the pet; AppKit detaches it on close.
+        """
+        bubble.owner = self
+        self._bubbles.append(bubble)
+        self.window.addChildWindow_ordered_(bubble, AppKit.NSWindowAbove)
+
+    def close_all_bubbles(self):
+        """Dismiss every open bubble in one batched window-server update."""
+        bubbles, self._bubbles = self._bubbles, []
+        NSAnimationContext.beginGrouping()
+        for b in bubbles:
+            b.owner = None   # skip the per-bubble close follow-ups
+            b.close()
+        NSAnimationContext.endGrouping()
+
     def remove_bubble(self, bubble):
         """Called by ChatBubble when it auto-closes"""
         try:
@@ -541,34 +718,6 @@ class PetDelegate(NSObject):
             # Cocoa has already closed the window – avoid touching it again
             bubble.owner = None
 
-    def reposition_bubbles(self):
-        """Place all bubbles relative to current pet window position."""
-        if not self._bubbles and not getattr(self, "_input_bubble", None):
-            return
-
-        pet_frame = self.window.frame()
-
-        # update chat bubbles
-        for b in list(self._bubbles):
-            try:
-                if b is None or not b.isVisible():
-                    raise RuntimeError
-                w, h = b.size
-                x = pet_frame.origin.x + (pet_frame.size.width - w) / 2
-                y = pet_frame.origin.y + pet_frame.size.height + 10
-                b.setFrameOrigin_((x, y))
-            except Exception:
-                # underlying window was closed – drop from list safely
-                self.remove_bubble(b)
-
-        # update input bubble if alive
-        ib = getattr(self, "_input_bubble", None)
-        if ib is not None:
-            w, h = ib.size
-            x = pet_frame.origin.x + (pet_frame.size.width - w) / 2
-            y = pet_frame.origin.y + pet_frame.size.height + 10
-            ib.setFrameOrigin_((x, y))
-
     # -------- called from DraggableImageView ---------------------------------
     def pop_menu_at_event(self, event, view):
         AppKit.NSMenu.popUpContextMenu_withEvent_forView_(self.menu, event, view)
@@ -588,31 +737,75 @@ class PetDelegate(NSObject):
         "thinking":  "doge-in-waves-loading-glitching.gif",
     }
 
-    def set_animation(self, key: str):
-        """Load a new GIF and restart the timer."""
-        fname = self.ANIMATIONS.get(key, self.ANIMATIONS["idle"])
-        path = os.path.join(os.path.dirname(__file__), "assets", "doge", fname)
-        if not os.path.exists(path):
-            return                                # keep current frames
+    def _load_frames(self, path):
+        """Decode every frame of the GIF at *path* into a list of CGImage.
 
-        import Quartz
+        Frames are redrawn once into premultiplied BGRA bitmaps already sized
+        for the pet window, so the compositor never has to resample them.
+        """
         src = Quartz.CGImageSourceCreateWithURL(AppKit.NSURL.fileURLWithPath_(path), None)
+        if src is None:
+            return []
+        px = self._frame_px
+        # one bitmap context reused for every frame; CGBitmapContextCreateImage
+        # copies on write, so each snapshot stays intact when we redraw
+        ctx = Quartz.CGBitmapContextCreate(
+            None, px, px, 8, px * 4,
+            Quartz.CGColorSpaceCreateDeviceRGB(),
+            Quartz.kCGImageAlphaPremultipliedFirst | Quartz.kCGBitmapByteOrder32Little,
+        )
+        if ctx is None:
+            return []
+        Quartz.CGContextSetInterpolationQuality(ctx, Quartz.kCGInterpolationHigh)
+        canvas = ((0, 0), (px, px))
+        # we keep our own pre-scaled copy, so ImageIO need not cache its decode
+        no_cache = {Quartz.kCGImageSourceShouldCache: False}
         frame_cnt = Quartz.CGImageSourceGetCount(src)
-        frames = []
+        frames = [None] * frame_cnt
+        j = 0
         for i in range(frame_cnt):
-            cgimg = Quartz.CGImageSourceCreateImageAtIndex(src, i, None)
+            cgimg = Quartz.CGImageSourceCreateImageAtIndex(src, i, no_cache)
             if cgimg is None:
                 continue  # skip broken frame to avoid crashes
-            nsimg = NSImage.alloc().initWithCGImage_size_(cgimg, (128, 128))
-            if nsimg is not None:
-                frames.append(nsimg)
+            # aspect-fit the source frame into the square bitmap
+            iw, ih = Quartz.CGImageGetWidth(cgimg), Quartz.CGImageGetHeight(cgimg)
+            k = min(px / iw, px / ih)
+            dw, dh = iw * k, ih * k
+            Quartz.CGContextClearRect(ctx, canvas)
+            Quartz.CGContextDrawImage(ctx, (((px - dw) / 2, (px - dh) / 2), (dw, dh)), cgimg)
+            pre = Quartz.CGBitmapContextCreateImage(ctx)
+            if pre is not None:
+                frames[j] = pre
+                j += 1
+        del src  # release the image source buffer
+        return frames[:j]
 
-        if not frames:
-            return  # failed to load, keep previous animation
+    def set_animation(self, key: str):
+        """Load a new GIF and restart the layer animation."""
+        fname = self.ANIMATIONS.get(key, self.ANIMATIONS["idle"])
 
-        self.frames = frames
-        self.frame_idx = 0
-        self.img_view.setImage_(self.frames[0])
+        # preloaded frames: a plain dict lookup, no file-system access
+        frames = self._frame_cache.get(fname)
+        if frames is not None:
+            self._wanted_gif = fname
+            self._install_frames(frames)
+        else:
+            path = os.path.join(_ASSET_DIR, fname)
+            if not os.path.exists(path):
+                return                            # keep current frames
+            # not preloaded yet – decode in the background, install when done
+            self._wanted_gif = fname
+            if fname not in self._decoding:
+                self._decoding.add(fname)
+                self._decode_queue.addOperationWithBlock_(
+                    lambda: self._decode_in_background(fname, path)
+                )
+
+        # only the latest mood may revert to idle
+        revert = getattr(self, "_revert_timer", None)
+        if revert is not None:
+            revert.invalidate()
+            self._revert_timer = None
 
         # Schedule automatic return to idle for transient moods
         if key not in ("idle", "thinking"):
@@ -623,25 +816,74 @@ class PetDelegate(NSObject):
                 None,
                 False,
             )
+            self._revert_timer.setTolerance_(0.5)
+
+    def _prefetch_animations(self):
+        """Queue every mood GIF behind the idle one so switches never wait."""
+        for fname in dict.fromkeys(self.ANIMATIONS.values()):
+            if fname in self._frame_cache or fname in self._decoding:
+                continue
+            path = os.path.join(_ASSET_DIR, fname)
+            if not os.path.exists(path):
+                continue
+            self._decoding.add(fname)
+            self._decode_queue.addOperationWithBlock_(
+                lambda f=fname, p=path: self._decode_in_background(f, p)
+            )
+
+    def _decode_in_background(self, fname, path):
+        """Runs on the decode queue; hands the frames back to the main thread."""
+        with objc.autorelease_pool():
+            frames = self._load_frames(path)
+
+        def _done():
+            self._decoding.discard(fname)
+            if not frames:
+                return  # failed to load, keep previous animation
+            self._frame_cache[fname] = frames
+            # a different mood may have been requested in the meantime
+            if self._wanted_gif == fname:
+                self._install_frames(frames)
+
+        NSOperationQueue.mainQueue().addOperationWithBlock_(_done)
+
+    def _install_frames(self, frames):
+        self.frames = frames
+        if self.window.occlusionState() & AppKit.NSWindowOcclusionStateVisible:
+            self._start_animation()
+        else:
+            self._anim_layer.setContents_(frames[0])
 
     # ObjC selector called by the timer above
     def revertToIdle_(self, _):  # noqa: N802
         self.set_animation("idle")
 
     # ---------------- quick price popup on single-click ------------------
-    def _ensure_price_snippet(self, force_fetch: bool = False):
-        """Return cached price snippet or fetch from CoinGecko."""
-        import time
-        now = time.time()
-        if not force_fetch and (now - self._price_cache["ts"] < 3600):
+    def _fetch_price_snippet(self, force: bool = False):
+        """Return cached price snippet or fetch from CoinGecko.
+
+        Shared by the price bubble and the chat worker thread.
+        """
+        now = _now()
+        if not force and (now - self._price_cache["ts"] < _PRICE_TTL_S):
             return self._price_cache["snippet"]
 
+        # revalidate with the last ETag so an unchanged price costs a bare 304
+        headers = {}
+        etag = self._price_cache.get("etag")
+        if etag and self._price_cache["snippet"]:
+            headers["If-None-Match"] = etag
+
         try:
-            resp = self._http.get(
+            resp = self._session().get(
                 "https://api.coingecko.com/api/v3/coins/markets",
                 params={"vs_currency": "usd", "ids": "dogecoin"},
+                headers=headers,
                 timeout=5,
             )
+            if resp.status_code == 304:
+                self._price_cache["ts"] = now
+                return self._price_cache["snippet"]
             data = resp.json()
             if isinstance(data, list) and data:
                 coin = data[0]
@@ -652,24 +894,40 @@ class PetDelegate(NSObject):
                         f"Dogecoin price: ${price:.4f} USD (24h {change:+.2f}%)."
                         if change is not None else f"Dogecoin price: ${price:.4f} USD."
                     )
-                    self._price_cache = {"ts": now, "snippet": snippet}
+                    self._price_cache = {
+                        "ts": now,
+                        "snippet": snippet,
+                        "etag": resp.headers.get("ETag"),
+                    }
                     return snippet
         except Exception:
             pass
         return ""
 
+    def _has_price_bubble(self):
+        return any(isinstance(b, PriceBubble) and b.isVisible() for b in self._bubbles)
+
     def show_price(self):
-        """Display current Dogecoin price in a bubble."""
+        """Display current Dogecoin price in a bubble.
+
+        The fetch (which may retry) runs on _HTTP_POOL so the UI never waits
+        on CoinGecko; the bubble is created back on the main thread.
+        """
         # avoid duplicate price bubbles
-        for b in self._bubbles:
-            if isinstance(b, PriceBubble) and b.isVisible():
-                return
+        if self._has_price_bubble():
+            return
+
+        def _fetch():
+            snippet = self._fetch_price_snippet() or "Price unavailable."
+            NSOperationQueue.mainQueue().addOperationWithBlock_(lambda: _show(snippet))
 
-        snippet = self._ensure_price_snippet(force_fetch=False) or "Price unavailable."
+        def _show(snippet):
+            if self._has_price_bubble():
+                return  # another request got there first
+            price_bubble = PriceBubble.alloc().initWithParent_message_(self.window, snippet)
+            self._add_bubble(price_bubble)
 
-        price_bubble = PriceBubble.alloc().initWithParent_message_(self.window, snippet)
-        price_bubble.owner = self
-        self._bubbles.append(price_bubble)
+        _HTTP_POOL.submit(_fetch)
 
     # Cocoa timer selector
     def showPriceTimer_(self, _):  # noqa: N802
@@ -751,13 +1009,13 @@ class PriceBubble(NSWindow):
             return None
 
         self.setOpaque_(False)
-        self.setBackgroundColor_(NSColor.clearColor())
+        self.setBackgroundColor_(_CLEAR)
         self.setLevel_(AppKit.NSFloatingWindowLevel)
 
         # bluish rounded background
         self.contentView().setWantsLayer_(True)
         bg_layer = self.contentView().layer()
-        bg_layer.setBackgroundColor_(NSColor.colorWithCalibratedRed_green_blue_alpha_(0.8, 0.9, 1.0, 0.95).CGColor())
+        bg_layer.setBackgroundColor_(_BUBBLE_BLUE_CG)
         bg_layer.setCornerRadius_(10.0)
 
         # label (smaller font)
@@ -766,13 +1024,13 @@ class PriceBubble(NSWindow):
         tf.setBordered_(False)
         tf.setEditable_(False)
         tf.setSelectable_(False)
-        tf.setBackgroundColor_(NSColor.clearColor())
+        tf.setBackgroundColor_(_CLEAR)
         tf.setAlignment_(AppKit.NSCenterTextAlignment)
         tf.setFont_(AppKit.NSFont.systemFontOfSize_(12))
         self.contentView().addSubview_(tf)
 
         self.orderFront_(None)
-        NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+        self._close_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
             3.5, self, "closeBubble:", None, False
         )
 
@@ -782,21 +1040,54 @@ class PriceBubble(NSWindow):
 
         return self
 
+    def close(self):
+        # drop the pending auto-close timer (it retains this window)
+        if self._close_timer is not None:
+            self._close_timer.invalidate()
+            self._close_timer = None
+        objc.super(PriceBubble, self).close()
+
     def canBecomeKeyWindow(self):  # noqa: N802
         return True
 
     def closeBubble_(self, _):
-        if self.owner is not None:
-            try:
-                self.owner.remove_bubble(self)
-            except Exception:
-                pass
+        if self.owner is not None and self in self.owner._bubbles:
+            self.owner.remove_bubble(self)
         self.close()
 
 
 # -------------------------------------------------------------- run the app
+def _run_event_loop(app, delegate):
+    """Dispatch events one at a time, each inside its own autorelease pool.
+
+    Timers and main-queue blocks still fire while we wait for the next event,
+    and transient Cocoa objects are released after every dispatch instead of
+    piling up in the outer pool. Runs until the delegate sets should_quit.
+    """
+    app.finishLaunching()
+    until = NSDate.distantFuture()  # frames are CA-driven – no need to poll
+    while not delegate.should_quit:
+        with objc.autorelease_pool():
+            # timers and main-queue blocks run inside nextEventMatching…, so
+            # the fetch needs the same protection as the dispatch
+            try:
+                evt = app.nextEventMatchingMask_untilDate_inMode_dequeue_(
+                    AppKit.NSEventMaskAny, until, AppKit.NSDefaultRunLoopMode, True
+                )
+                if evt is not None:
+                    app.sendEvent_(evt)
+                app.updateWindows()
+            except Exception:
+                # report and keep dispatching; one failing callback should
+                # not take the whole pet down
+                traceback.print_exc()
+
+
 if __name__ == "__main__":
-    app = NSApplication.sharedApplication()
-    delegate = PetDelegate.alloc().init()
-    app.setDelegate_(delegate)
-    AppHelper.runEventLoop()
\ No newline at end of file
+    with objc.autorelease_pool():
+        app = NSApplication.sharedApplication()
+        # no Dock icon / menu bar, also when run from source (LSUIElement in the bundle)
+        app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyAccessory)
+        delegate = PetDelegate.alloc().init()
+        app.setDelegate_(delegate)
+    _run_event_loop(app, delegate)
\ No newline at end of file
@@ -1,17 +1,84 @@
 from setuptools import setup
-import sys, os, glob
+import sys, os, pickle
 
 APP = ["cocoa_pet.py"]
-# Ship only the Doge animation frames (skip hidden files such as .DS_Store)
-DATA_FILES = [
-    (
-        "assets/doge",
-        [
-            f for f in glob.glob("assets/doge/**/*", recursive=True)
-            if os.path.isfile(f) and not os.path.basename(f).startswith(".")
-        ],
-    ),
-]
+ASSETS = "assets/doge"
+# discovered DATA_FILES, reused while the asset directories are unchanged
+MANIFEST = os.path.join("build", "asset_manifest.pkl")
+
+
+def _walk_assets(root):
+    """Return {relative_dir: [paths...]} for every non-hidden file below *root*.
+
+    Iterative os.scandir walk: file/dir type comes from the directory read
+    itself, so no extra stat() per entry.
+    """
+    groups = {}
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        rel = os.path.relpath(d, root)  # once per directory, not per file
+        with os.scandir(d) as it:
+            for e in it:
+                if e.name[:1] == ".":
+                    continue  # hidden files such as .DS_Store
+                # files first: they are the common case, so on filesystems
+                # that cannot report the type in readdir an entry costs at
+                # most one fallback stat()
+                if e.is_file(follow_symlinks=False):
+                    groups.setdefault(rel, []).append(e.path)
+                elif e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+    return groups
+
+
+def _assets_key(root):
+    """Cheap fingerprint: the mtime of every directory below *root*.
+
+    A directory's mtime changes when files directly inside it are added,
+    removed or renamed, so covering every level catches nested changes too.
+    Only directories are walked; files are never stat()ed.
+    """
+    dirs = []
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        dirs.append((os.path.relpath(d, root), os.stat(d).st_mtime_ns))
+        with os.scandir(d) as it:
+            for e in it:
+                if e.name[:1] != "." and e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+    return tuple(sorted(dirs))
+
+
+def _asset_data_files(root):
+    """Build DATA_FILES for *root*, via the pickled manifest when still valid."""
+    key = _assets_key(root)
+    try:
+        with open(MANIFEST, "rb") as fh:
+            cached_key, data_files = pickle.load(fh)
+        if cached_key == key:
+            return data_files
+    except Exception:
+        pass  # missing or stale cache – rediscover below
+
+    # one (target_dir, files) entry per directory, so py2app copies sibling
+    # files together and keeps the layout
+    data_files = [
+        (os.path.join(root, rel) if rel != "." else root, sorted(paths))
+        for rel, paths in sorted(_walk_assets(root).items())
+    ]
+    try:
+        os.makedirs(os.path.dirname(MANIFEST), exist_ok=True)
+        with open(MANIFEST, "wb") as fh:
+            pickle.dump((key, data_files), fh, protocol=5)
+    except OSError:
+        pass  # caching is best-effort, never block a build
+    return data_files
+
+
+# Ship only the Doge animation frames
+DATA_FILES = _asset_data_files(ASSETS)
 
 OPTIONS = {
     # remove Dock icon / menu-bar by running as a background-only app
@@ -23,15 +90,34 @@ OPTIONS = {
               "CFBundleShortVersionString": "1.0",
               "CFBundleVersion": "1.0",
               "NSHighResolutionCapable": True,
+              # never try to write .pyc files into the (signed) bundle
+              "LSEnvironment": {"PYTHONDONTWRITEBYTECODE": "1"},
               # leave icon assignment to the separate "iconfile" option
               },
-    "packages": ["requests", "openai"],
+    # pure-Python deps (requests, urllib3, idna, charset_normalizer) are left
+    # to modulegraph so they land in the bundle's zipped stdlib/site-packages
+    # archive. Only packages that must exist as real directories stay here:
+    # certifi reads cacert.pem from disk.
+    "packages": ["certifi"],
     # include any modules py2app might fail to discover automatically
+    # (Quartz / QuartzCore are used for GIF decoding and the layer animation)
     "includes": ["Quartz", "objc"],
-    # resources copied verbatim in Contents/Resources/
-    "resources": ["assets/doge"],
+    # the chat API is called through requests – keep the openai SDK and its
+    # dependency tree (and other dev-only packages) out of the bundle
+    "excludes": ["openai", "pydantic", "pydantic_core", "httpx", "anyio", "distro",
+                 "tkinter", "test", "unittest", "pygments", "IPython"],
+    # assets reach Contents/Resources/assets/doge via DATA_FILES above; no
+    # second verbatim copy under "resources"
     # optional icon – build one with `iconutil -c icns Doge.iconset`
     "iconfile": "assets/doge/Doge.icns",
+    # the pet takes no file arguments – skip the launch-time Apple Event wait
+    "argv_emulation": False,
+    # compile bundled bytecode with -OO (no docstrings / asserts); zipped
+    # modules are stored as bytecode only
+    "optimize": 2,
+    # the DMG must stay self-contained, so the build stays fully standalone;
+    # "semi_standalone": True (link to the system framework Python) starts a
+    # little faster but only works where that exact Python is installed
 }
 
 setup(